@@ -3,9 +3,10 @@ import logging
 from flask import Flask, render_template, jsonify, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
+from sqlalchemy.exc import IntegrityError
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging (set LOG_LEVEL=DEBUG for verbose local output)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
@@ -14,10 +15,23 @@ app = Flask(__name__)
 # Configure SQLAlchemy
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Keep a warm pool of Postgres connections; SQLite (used for local tests)
+# manages its own pool and rejects the sizing options. Each request thread
+# needs at most one connection, so the pool matches the gunicorn thread
+# count; the whole deployment opens up to workers * (threads + 2)
+# connections, which must stay below Postgres' max_connections (100 by
+# default).
+if not (app.config["SQLALCHEMY_DATABASE_URI"] or "").startswith("sqlite"):
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_size": int(os.environ.get("GUNICORN_THREADS", 8)),
+        "max_overflow": 2,
+        "pool_recycle": 3600,
+        "pool_pre_ping": True,
+    }
 app.secret_key = os.environ.get("SESSION_SECRET")
 
-# Initialize SQLAlchemy
-db = SQLAlchemy(app)
+# Initialize SQLAlchemy (see models.py for the session options)
+db = SQLAlchemy(app, session_options={"autoflush": False, "expire_on_commit": False})
 
 # Initialize LoginManager
 login_manager = LoginManager()
@@ -39,16 +53,12 @@ def index():
 @app.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
-    logger.debug(f"Register attempt with data: {data}")
+    logger.debug("Register attempt with data: %s", data)
 
     # Basic validation
     if not data or 'email' not in data or 'password' not in data or 'username' not in data:
         return jsonify({'error': 'Missing required fields'}), 400
 
-    # Check if user exists
-    if User.query.filter_by(email=data['email']).first():
-        return jsonify({'error': 'Email already registered'}), 400
-
     # Create new user
     user = User(
         username=data['username'],
@@ -56,16 +66,20 @@ def register():
     )
     user.set_password(data['password'])
 
-    # Save to database
-    db.session.add(user)
-    db.session.commit()
+    # Save to database; the unique email constraint rejects duplicates
+    try:
+        db.session.add(user)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Email already registered'}), 400
 
     return jsonify({'message': 'Registration successful'}), 201
 
 @app.route('/login', methods=['POST'])
 def login():
     data = request.get_json()
-    logger.debug(f"Login attempt for email: {data.get('email')}")
+    logger.debug("Login attempt for email: %s", data.get('email'))
 
     # Basic validation
     if not data or 'email' not in data or 'password' not in data:
@@ -85,14 +99,16 @@ def logout():
     logout_user()
     return jsonify({'message': 'Logout successful'})
 
-# Create database tables
-with app.app_context():
+# Create database tables once per deploy with `flask --app app init-db`
+# instead of on every worker import
+@app.cli.command("init-db")
+def init_db():
     db.create_all()
     logger.info("Database tables created")
 
-# Log all registered routes
-for rule in app.url_map.iter_rules():
-    logger.info(f"Route registered: {rule}")
+# Registered routes are listed on demand with `flask --app app routes`
 
+# Local development server only. Set FLASK_DEBUG=1 for the debugger and
+# reloader.
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
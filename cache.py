@@ -0,0 +1,58 @@
+import os
+import logging
+import redis
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Shared Redis client for short-lived response caches. Caching is disabled
+# when REDIS_URL is not set, and Redis errors are logged and treated as a
+# miss, so the app keeps working without a cache server.
+REDIS_URL = os.environ.get("REDIS_URL")
+client = redis.Redis.from_url(REDIS_URL) if REDIS_URL else None
+
+def get_cached(key):
+    if client is None:
+        return None
+    try:
+        return client.get(key)
+    except redis.RedisError as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+
+def set_cached(key, value, ttl):
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl, value)
+    except redis.RedisError as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+def delete_cached(*keys):
+    if client is None or not keys:
+        return
+    try:
+        client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning("Cache delete failed for %s: %s", keys, e)
+
+def incr_cached(key):
+    """Increment a counter and return its new value (None if unavailable)"""
+    if client is None:
+        return None
+    try:
+        return client.incr(key)
+    except redis.RedisError as e:
+        logger.warning("Cache increment failed for %s: %s", key, e)
+        return None
+
+def tee_to_cache(key, chunks, ttl):
+    """Pass byte chunks through, caching the joined body once all are sent"""
+    if client is None:
+        yield from chunks
+        return
+    body = []
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    set_cached(key, b''.join(body), ttl)
@@ -0,0 +1,67 @@
+import os
+from datetime import date
+
+import pytest
+
+# Run against an in-memory database unless the environment provides one
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SESSION_SECRET", "test")
+
+import cache
+from main import app
+from models import db, User, Player
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for the cache helpers"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Logged-in test client owning player 1, with uploads in a temp folder"""
+    monkeypatch.setattr(cache, "client", None)
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(tmp_path))
+
+    with app.app_context():
+        db.create_all()
+        user = User(first_name="Test", last_name="Player", date_of_birth=date(2000, 1, 1),
+                    email="player@example.com", role="player")
+        user.set_password("secret")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Player(user_id=user.id))
+        db.session.commit()
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+    yield client
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def fake_redis(client, monkeypatch):
+    """Back the cache helpers with an in-process FakeRedis"""
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "client", fake)
+    return fake
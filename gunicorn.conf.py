@@ -0,0 +1,26 @@
+import os
+
+# Gunicorn settings for the production entrypoint (`gunicorn main:app`).
+# Gunicorn picks this file up automatically from the working directory.
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+
+# The views are I/O bound (Postgres round-trips) plus password hashing, which
+# runs in C with the GIL released. Threaded workers let one process keep
+# serving requests while other threads wait on the database, so a few
+# processes are enough. The default is fixed rather than taken from the CPU
+# count, which in containers reports the host's cores, not the quota; set
+# WEB_CONCURRENCY to match the cores actually available.
+#
+# Connection budget: every worker holds a pool of `threads` Postgres
+# connections plus 2 overflow (see SQLALCHEMY_ENGINE_OPTIONS in main.py), so
+# the deployment uses up to workers * (threads + 2) connections: 40 with the
+# defaults. Keep that below the server's max_connections (100 by default)
+# when raising either setting.
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+# Hold idle client connections open a little longer than the 2 s default so
+# clients and proxies can reuse them for follow-up requests
+keepalive = 5
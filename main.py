@@ -1,11 +1,19 @@
 import os
 import logging
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+import orjson
+from datetime import date, datetime
+from flask import Flask, Response, g, render_template, jsonify, request, redirect, url_for, stream_with_context
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_babel import Babel, gettext as _
-
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+from flask_migrate import Migrate
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, joinedload, make_transient_to_detached
+from responses import stream_json_array
+from cache import get_cached, set_cached, tee_to_cache
+from query_debug import warn_on_repeated_lazy_loads
+
+# Configure logging (set LOG_LEVEL=DEBUG for verbose local output)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
@@ -14,20 +22,37 @@ app = Flask(__name__)
 # Configure SQLAlchemy and other basic settings
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Keep a warm pool of Postgres connections; SQLite (used for local tests)
+# manages its own pool and rejects the sizing options. Each request thread
+# needs at most one connection, so the pool matches the gunicorn thread
+# count; the whole deployment opens up to workers * (threads + 2)
+# connections, which must stay below Postgres' max_connections (100 by
+# default).
+if not (app.config["SQLALCHEMY_DATABASE_URI"] or "").startswith("sqlite"):
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_size": int(os.environ.get("GUNICORN_THREADS", 8)),
+        "max_overflow": 2,
+        "pool_recycle": 3600,
+        "pool_pre_ping": True,
+    }
 app.secret_key = os.environ.get("SESSION_SECRET")
 
 # Configure Babel
 app.config['BABEL_DEFAULT_LOCALE'] = 'en'
 app.config['BABEL_SUPPORTED_LOCALES'] = ['en', 'it']  # English and Italian support
+SUPPORTED_LOCALES = frozenset(app.config['BABEL_SUPPORTED_LOCALES'])
 babel = Babel()
 
 def select_locale():
-    # Try to get locale from the query parameter
+    # Resolve once per request; templates call get_locale repeatedly
+    if '_locale' in g:
+        return g._locale
+    # Try to get locale from the query parameter, defaulting to English
     locale = request.args.get('lang')
-    if locale and locale in app.config['BABEL_SUPPORTED_LOCALES']:
-        return locale
-    # Default to English if no match is found
-    return 'en'
+    if locale not in SUPPORTED_LOCALES:
+        locale = 'en'
+    g._locale = locale
+    return locale
 
 # Make select_locale available to templates
 @app.context_processor
@@ -38,27 +63,75 @@ babel.init_app(app, locale_selector=select_locale)
 
 # Configure upload settings
 UPLOAD_FOLDER = os.path.join(app.root_path, 'uploads')
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
+# Lifetime (seconds) of cached scouting pages and search results; new
+# players show up once the entries expire
+SCOUTING_CACHE_TTL = 30
+SEARCH_CACHE_TTL = 30
+# Lifetime (seconds) of the cached logged-in user; updates invalidate it
+USER_CACHE_TTL = 300
+
 # Import and initialize models
-from models import db, User, Player
+from models import db, User, Player, Video, user_cache_key
 db.init_app(app)
 
+# Schema changes are Alembic migrations in migrations/, applied once per
+# deploy with `flask --app main db upgrade`
+migrate = Migrate(app, db)
+
+# Flag likely N+1 queries while developing (FLASK_DEBUG=1)
+if app.debug:
+    warn_on_repeated_lazy_loads()
+
 # Initialize LoginManager
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
 # Import and register blueprints
-from video_routes import video_bp
+from video_routes import video_bp, UploadRequest
 app.register_blueprint(video_bp)
+app.request_class = UploadRequest
 
 @login_manager.user_loader
 def load_user(id):
-    return User.query.get(int(id))
+    # Rebuild the user from the cache when possible; merge(load=False)
+    # attaches it to the session without a SELECT, and relationships and
+    # uncached columns still load on access
+    cache_key = user_cache_key(id)
+    cached = get_cached(cache_key)
+    if cached is not None:
+        try:
+            # Plain JSON rather than pickle, so a write to Redis can never
+            # run code in the app; dates come back as ISO 8601 strings
+            fields = orjson.loads(cached)
+            fields['date_of_birth'] = date.fromisoformat(fields['date_of_birth'])
+            if fields['created_at'] is not None:
+                fields['created_at'] = datetime.fromisoformat(fields['created_at'])
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed cached user %s", id)
+        else:
+            user = User(**fields)
+            make_transient_to_detached(user)
+            return db.session.merge(user, load=False)
+
+    user = User.query.get(int(id))
+    if user is not None:
+        fields = {column: getattr(user, column) for column in User.CACHED_COLUMNS}
+        set_cached(cache_key, orjson.dumps(fields), USER_CACHE_TTL)
+    return user
+
+def player_listing_query():
+    # Eager-load the relationships the listing templates walk, so rendering
+    # N players costs a fixed number of queries instead of one per player.
+    # Columns the listings never show are deferred and not transferred.
+    return Player.query.options(
+        selectinload(Player.videos).defer(Video.tags).defer(Video.notes),
+        joinedload(Player.user).defer(User.password_hash)
+    )
 
 @app.route('/')
 def index():
@@ -70,33 +143,35 @@ def dashboard():
     try:
         logger.debug("Dashboard route accessed")
         # Get all players for the current user
-        players = Player.query.filter_by(user_id=current_user.id).order_by(Player.created_at.desc()).all()
+        players = player_listing_query().filter_by(user_id=current_user.id).order_by(Player.created_at.desc()).all()
         return render_template('dashboard.html', players=players)
     except Exception as e:
-        logger.error(f"Error in dashboard route: {str(e)}", exc_info=True)
+        logger.error("Error in dashboard route: %s", e, exc_info=True)
         return redirect(url_for('index'))
 
 @app.route('/register', methods=['POST'])
 def register():
     logger.debug("Register endpoint called")
     data = request.get_json()
-    logger.debug(f"Register data: {data}")
+    logger.debug("Register data: %s", data)
 
     if not data or 'email' not in data or 'password' not in data or 'username' not in data:
         return jsonify({'error': 'Missing required fields'}), 400
 
-    if User.query.filter_by(email=data['email']).first():
-        return jsonify({'error': 'Email already registered'}), 400
-
     user = User(
         username=data['username'],
         email=data['email']
     )
     user.set_password(data['password'])
 
-    db.session.add(user)
-    db.session.commit()
-    logger.info(f"User registered: {user.email}")
+    # The unique email constraint rejects duplicates
+    try:
+        db.session.add(user)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Email already registered'}), 400
+    logger.info("User registered: %s", user.email)
 
     # Login the user after successful registration
     login_user(user)
@@ -112,15 +187,17 @@ def login():
         return redirect(url_for('index'))
 
     data = request.get_json()
-    logger.debug(f"Login data: {data}")
+    logger.debug("Login data: %s", data)
 
     if not data or 'email' not in data or 'password' not in data:
         return jsonify({'error': 'Missing email or password'}), 400
 
     user = User.query.filter_by(email=data['email']).first()
     if user and user.check_password(data['password']):
+        # Saves the hash check_password upgraded, if any
+        db.session.commit()
         login_user(user)
-        logger.info(f"User logged in: {user.email}")
+        logger.info("User logged in: %s", user.email)
         return jsonify({
             'message': 'Login successful',
             'redirect': url_for('index')  # Redirect to landing page
@@ -149,7 +226,7 @@ def check_auth():
 @app.route('/players/<int:player_id>')
 @login_required
 def player_profile(player_id):
-    player = Player.query.get_or_404(player_id)
+    player = Player.query.options(selectinload(Player.videos)).get_or_404(player_id)
 
     # Ensure the user has access to this player
     if player.user_id != current_user.id:
@@ -162,10 +239,10 @@ def player_profile(player_id):
 def home():
     try:
         logger.debug("Home route accessed")
-        players = Player.query.filter_by(user_id=current_user.id).order_by(Player.created_at.desc()).all()
+        players = player_listing_query().filter_by(user_id=current_user.id).order_by(Player.created_at.desc()).all()
         return render_template('index.html', players=players)
     except Exception as e:
-        logger.error(f"Error in home route: {str(e)}", exc_info=True)
+        logger.error("Error in home route: %s", e, exc_info=True)
         return redirect(url_for('index'))
 
 @app.route('/api/players', methods=['POST'])
@@ -173,7 +250,7 @@ def home():
 def create_player():
     logger.debug("Create player endpoint called")
     data = request.get_json()
-    logger.debug(f"Player data received: {data}")
+    logger.debug("Player data received: %s", data)
 
     # Basic validation
     if not data or not all(key in data for key in ['name', 'team', 'role']):
@@ -194,7 +271,7 @@ def create_player():
         # Save to database
         db.session.add(player)
         db.session.commit()
-        logger.info(f"Player created: {player.name}")
+        logger.info("Player created: %s", player.name)
 
         return jsonify({
             'message': 'Player created successfully',
@@ -209,7 +286,7 @@ def create_player():
         }), 201
 
     except Exception as e:
-        logger.error(f"Error creating player: {str(e)}", exc_info=True)
+        logger.error("Error creating player: %s", e, exc_info=True)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -218,11 +295,20 @@ def create_player():
 def scouting():
     try:
         logger.debug("Scouting page accessed")
+        # The page embeds the user's navigation and language, so cache it per
+        # user and locale
+        cache_key = f"scouting:{current_user.id}:{select_locale()}"
+        cached = get_cached(cache_key)
+        if cached is not None:
+            return cached.decode()
+
         # Get all players from all users
-        players = Player.query.order_by(Player.created_at.desc()).all()
-        return render_template('scouting.html', players=players)
+        players = player_listing_query().order_by(Player.created_at.desc()).all()
+        html = render_template('scouting.html', players=players)
+        set_cached(cache_key, html.encode(), SCOUTING_CACHE_TTL)
+        return html
     except Exception as e:
-        logger.error(f"Error in scouting route: {str(e)}", exc_info=True)
+        logger.error("Error in scouting route: %s", e, exc_info=True)
         return redirect(url_for('index'))
 
 
@@ -232,17 +318,12 @@ def user_profile():
     try:
         logger.debug("User profile route accessed")
         # Get all players for the current user
-        players = Player.query.filter_by(user_id=current_user.id).order_by(Player.created_at.desc()).all()
+        players = player_listing_query().filter_by(user_id=current_user.id).order_by(Player.created_at.desc()).all()
         return render_template('user_profile.html', players=players)
     except Exception as e:
-        logger.error(f"Error in user profile route: {str(e)}", exc_info=True)
+        logger.error("Error in user profile route: %s", e, exc_info=True)
         return redirect(url_for('index'))
 
-# Create database tables
-with app.app_context():
-    db.create_all()
-    logger.info("Database tables created")
-
 @app.route('/api/players/search')
 def search_players():
     try:
@@ -251,35 +332,50 @@ def search_players():
         team = request.args.get('team', '').lower()
         role = request.args.get('role', '')
 
-        # Base query
-        query = Player.query
+        # Filters are joined with a control character so values containing
+        # ':' cannot collide with another filter combination
+        cache_key = f"search:{name}\x1f{team}\x1f{role}"
+        cached = get_cached(cache_key)
+        if cached is not None:
+            return Response(cached, mimetype='application/json')
+
+        # Select only the columns the response needs; plain rows skip ORM
+        # object construction and identity-map bookkeeping
+        query = db.select(
+            Player.id,
+            Player.name,
+            Player.team,
+            Player.role,
+            Player.goals,
+            Player.assists
+        )
 
         # Apply filters
         if name:
-            query = query.filter(db.func.lower(Player.name).like(f'%{name}%'))
+            query = query.where(db.func.lower(Player.name).like(f'%{name}%'))
         if team:
-            query = query.filter(db.func.lower(Player.team).like(f'%{team}%'))
+            query = query.where(db.func.lower(Player.team).like(f'%{team}%'))
         if role:
-            query = query.filter(Player.role == role)
-
-        # Execute query and get results
-        players = query.order_by(Player.created_at.desc()).all()
+            query = query.where(Player.role == role)
 
-        # Convert to JSON-serializable format
-        players_data = [{
-            'id': player.id,
-            'name': player.name,
-            'team': player.team,
-            'role': player.role,
-            'goals': player.goals,
-            'assists': player.assists
-        } for player in players]
+        # Fetch rows in batches and stream the JSON array out as it is
+        # encoded, so large result sets are never held in memory at once
+        result = db.session.execute(
+            query.order_by(Player.created_at.desc()).execution_options(yield_per=500)
+        )
+        players_data = tee_to_cache(
+            cache_key,
+            stream_json_array(row._asdict() for row in result),
+            SEARCH_CACHE_TTL
+        )
 
-        return jsonify(players_data)
+        return Response(stream_with_context(players_data), mimetype='application/json')
 
     except Exception as e:
-        logger.error(f"Error in search players: {str(e)}", exc_info=True)
+        logger.error("Error in search players: %s", e, exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+# Local development server only; production runs `gunicorn main:app` with
+# gunicorn.conf.py. Set FLASK_DEBUG=1 for the debugger and reloader.
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""video tags jsonb
+
+Revision ID: 5b2f0c9d81a4
+Revises: 303de3e06727
+Create Date: 2026-10-15 10:52:04.118736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2f0c9d81a4'
+down_revision = '303de3e06727'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Other databases keep the plain JSON column and a regular index
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('video', 'tags',
+                   existing_type=sa.JSON(),
+                   type_=postgresql.JSONB(),
+                   postgresql_using='tags::jsonb')
+    with op.batch_alter_table('video', schema=None) as batch_op:
+        batch_op.create_index('ix_video_tags', ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    with op.batch_alter_table('video', schema=None) as batch_op:
+        batch_op.drop_index('ix_video_tags', postgresql_using='gin')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('video', 'tags',
+                   existing_type=postgresql.JSONB(),
+                   type_=sa.JSON(),
+                   postgresql_using='tags::json')
@@ -0,0 +1,35 @@
+"""make video upload date not null
+
+Revision ID: 94dd724af52d
+Revises: 34df3d737001
+Create Date: 2026-10-15 11:15:11.386098
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '94dd724af52d'
+down_revision = '34df3d737001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows inserted without the ORM default have no date; they would break
+    # the listing's (upload_date, id) cursor. Give them the migration time.
+    op.execute("UPDATE video SET upload_date = CURRENT_TIMESTAMP WHERE upload_date IS NULL")
+    with op.batch_alter_table('video', schema=None) as batch_op:
+        batch_op.alter_column('upload_date',
+               existing_type=sa.DateTime(),
+               server_default=sa.text('CURRENT_TIMESTAMP'),
+               nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('video', schema=None) as batch_op:
+        batch_op.alter_column('upload_date',
+               existing_type=sa.DateTime(),
+               server_default=None,
+               nullable=True)
@@ -1,10 +1,23 @@
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import JSONB
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from datetime import date, datetime
+from functools import cached_property
+from itertools import chain
+from cache import delete_cached
 
-# Initialize SQLAlchemy
-db = SQLAlchemy()
+# Initialize SQLAlchemy. Handlers flush explicitly when they need generated
+# ids, and objects stay readable after commit without a refresh SELECT.
+db = SQLAlchemy(session_options={"autoflush": False, "expire_on_commit": False})
+
+# argon2id with the OWASP minimum parameters (19 MiB, 2 passes): cheaper to
+# verify than werkzeug's 600k-iteration pbkdf2 for comparable strength
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19 * 1024, parallelism=1)
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -17,6 +30,10 @@ class User(UserMixin, db.Model):
     role = db.Column(db.String(20), nullable=False)  # 'player', 'parent', 'coach', 'scout'
     team = db.Column(db.String(100))  # Optional team field
 
+    # Columns kept in the login cache (see main.load_user); password_hash is
+    # left out and only fetched from the database if something reads it
+    CACHED_COLUMNS = ('id', 'first_name', 'last_name', 'date_of_birth', 'email', 'created_at', 'role', 'team')
+
     # Add relationship to players
     players = db.relationship('Player', backref='user', lazy=True)
     # Add relationship for parent-child
@@ -25,15 +42,30 @@ class User(UserMixin, db.Model):
     access_requests = db.relationship('AccessRequest', backref='coach', lazy=True, foreign_keys='AccessRequest.coach_id')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Verify a password, upgrading an outdated hash on success (caller commits)"""
+        if self.password_hash.startswith('$argon2'):
+            try:
+                password_hasher.verify(self.password_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+            needs_rehash = password_hasher.check_needs_rehash(self.password_hash)
+        else:
+            # Accounts created before the switch to argon2 keep their pbkdf2
+            # hash until their next successful login
+            if not check_password_hash(self.password_hash, password):
+                return False
+            needs_rehash = True
+        if needs_rehash:
+            self.set_password(password)
+        return True
 
-    @property
+    @cached_property
     def age(self):
-        """Calculate user's age"""
-        today = datetime.now()
+        """Calculate user's age (computed once per loaded instance)"""
+        today = date.today()
         return today.year - self.date_of_birth.year - ((today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day))
 
     @property
@@ -41,10 +73,39 @@ class User(UserMixin, db.Model):
         """Return user's full name"""
         return f"{self.first_name} {self.last_name}"
 
+    def cache_keys(self):
+        """Cache entries to drop once a change to this row commits"""
+        return [user_cache_key(self.id)]
+
+def user_cache_key(user_id):
+    return f"user:{user_id}"
+
+# Cached rows are dropped after the commit, not at flush time: a request
+# that misses the cache between the flush and the commit would otherwise
+# read the still-committed old row and cache it again
+@event.listens_for(Session, 'after_flush')
+def collect_stale_cache_keys(session, flush_context):
+    keys = session.info.setdefault('stale_cache_keys', set())
+    for obj in chain(session.dirty, session.deleted):
+        if hasattr(obj, 'cache_keys'):
+            keys.update(obj.cache_keys())
+
+@event.listens_for(Session, 'after_commit')
+def delete_stale_cache_keys(session):
+    delete_cached(*session.info.pop('stale_cache_keys', ()))
+
+@event.listens_for(Session, 'after_rollback')
+def forget_stale_cache_keys(session):
+    session.info.pop('stale_cache_keys', None)
+
 class Player(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    # Profile shown in scouting searches
+    name = db.Column(db.String(100))
+    team = db.Column(db.String(100))
+    role = db.Column(db.String(50))  # Playing position
     # Player statistics
     goals = db.Column(db.Integer, default=0)
     assists = db.Column(db.Integer, default=0)
@@ -56,6 +117,15 @@ class Player(db.Model):
     parent_relationships = db.relationship('PlayerParent', backref='player', lazy=True)
     # Add relationship for coach access
     access_requests = db.relationship('AccessRequest', backref='player', lazy=True)
+    # Index for the per-user listings ordered by newest first
+    __table_args__ = (db.Index('ix_player_user_created', user_id, created_at.desc()),)
+
+    def cache_keys(self):
+        """Cache entries to drop once a change to this row commits"""
+        return [player_owner_cache_key(self.id)]
+
+def player_owner_cache_key(player_id):
+    return f"player:{player_id}:owner"
 
 class PlayerParent(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -79,14 +149,29 @@ class Video(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     filename = db.Column(db.String(255), nullable=True)  # Made optional
+    original_filename = db.Column(db.String(255), nullable=True)  # Name of the file as uploaded
     video_url = db.Column(db.String(500), nullable=True)  # Added for YouTube URLs
     video_type = db.Column(db.String(20), nullable=False, default='file')  # 'file' or 'youtube'
     youtube_id = db.Column(db.String(20), nullable=True)  # Store YouTube video ID
-    upload_date = db.Column(db.DateTime, default=datetime.utcnow)
+    upload_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=db.func.now())
     duration = db.Column(db.Float)  # Video duration in seconds
-    filesize = db.Column(db.Integer)  # File size in bytes
+    filesize = db.Column(db.BigInteger)  # File size in bytes
     player_id = db.Column(db.Integer, db.ForeignKey('player.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     # Video metadata
-    tags = db.Column(db.JSON, default=list)  # Store tags as JSON array
-    notes = db.Column(db.Text)  # Additional notes about the video/action
\ No newline at end of file
+    tags = db.Column(db.JSON().with_variant(JSONB, 'postgresql'), default=list)  # Store tags as JSON array
+    notes = db.Column(db.Text)  # Additional notes about the video/action
+    action_type = db.Column(db.String(50))  # Kind of action shown in the video
+    skill_rating = db.Column(db.Integer)  # Rating given to the action
+    __table_args__ = (
+        # GIN index so tag containment queries (tags @> '["dribbling"]') use the index
+        db.Index('ix_video_tags', tags, postgresql_using='gin'),
+        # Covers the player video listing so Postgres can answer it with an
+        # index-only scan, newest first; id is part of the key because the
+        # listing pages on (upload_date, id)
+        db.Index(
+            'ix_video_player_date', player_id, upload_date.desc(), id.desc(),
+            postgresql_include=['title', 'video_type', 'youtube_id',
+                                'filename', 'original_filename', 'duration', 'filesize']
+        ),
+    )
\ No newline at end of file
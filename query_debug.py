@@ -0,0 +1,22 @@
+import logging
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def warn_on_repeated_lazy_loads():
+    """Log relationships that are lazy-loaded more than once per request"""
+    # A second lazy load of the same relationship within one request almost
+    # always comes from a loop over parent objects (an N+1). Fix it with
+    # selectinload/joinedload on the query that produced the parents.
+    @event.listens_for(Session, 'do_orm_execute')
+    def track_lazy_load(orm_execute_state):
+        if orm_execute_state.lazy_loaded_from is None or not has_request_context():
+            return
+        relationship = str(orm_execute_state.loader_strategy_path.prop)
+        counts = g.setdefault('_lazy_load_counts', {})
+        counts[relationship] = counts.get(relationship, 0) + 1
+        if counts[relationship] == 2:
+            logger.warning("Potential n+1 query detected on %s", relationship)
@@ -0,0 +1,25 @@
+import orjson
+from flask import Response
+
+# Flush the streamed body in blocks of roughly this size rather than one
+# tiny write per row
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def stream_json_array(items):
+    """Serialize an iterable of dicts as a JSON array, yielding byte chunks"""
+    buffer = bytearray(b'[')
+    for index, item in enumerate(items):
+        if index:
+            buffer += b','
+        buffer += orjson.dumps(item)
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b']'
+    yield bytes(buffer)
+
+def ojsonify(obj):
+    """Drop-in for jsonify() that encodes with orjson"""
+    # orjson encodes datetimes natively, in the same ISO 8601 form as
+    # datetime.isoformat()
+    return Response(orjson.dumps(obj), mimetype='application/json')
@@ -1,12 +1,12 @@
 from flask import render_template, jsonify, request, Blueprint, url_for, redirect
 from flask_login import login_user, logout_user, login_required, current_user
+from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash
 from datetime import datetime, date
 import logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 # Create blueprint for authentication routes
 auth_bp = Blueprint('auth', __name__)
@@ -18,11 +18,13 @@ def calculate_age(birth_date):
 @auth_bp.route('/register', methods=['POST'])
 def register():
     try:
-        # Log request information
-        logger.debug("=== REGISTRATION REQUEST DEBUG ===")
-        logger.debug(f"Headers: {dict(request.headers)}")
-        logger.debug(f"Raw Data: {request.get_data(as_text=True)}")
-        logger.debug(f"Content Type: {request.content_type}")
+        # Log request information (copying headers and body is skipped
+        # entirely unless debug logging is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=== REGISTRATION REQUEST DEBUG ===")
+            logger.debug("Headers: %s", dict(request.headers))
+            logger.debug("Raw Data: %s", request.get_data(as_text=True))
+            logger.debug("Content Type: %s", request.content_type)
 
         # Basic request validation
         if not request.is_json:
@@ -30,7 +32,7 @@ def register():
             return jsonify({'error': 'Content-Type must be application/json'}), 400
 
         data = request.get_json()
-        logger.debug(f"Parsed JSON data: {data}")
+        logger.debug("Parsed JSON data: %s", data)
 
         if not data:
             logger.error("No data received")
@@ -40,34 +42,31 @@ def register():
         required_fields = ['first_name', 'last_name', 'date_of_birth', 'email', 'password']
 
         # Log all received fields
-        logger.debug("Received fields:")
-        for field in required_fields:
-            logger.debug(f"{field}: {data.get(field, 'MISSING')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received fields:")
+            for field in required_fields:
+                logger.debug("%s: %s", field, data.get(field, 'MISSING'))
 
         missing_fields = [field for field in required_fields if not data.get(field)]
         if missing_fields:
-            logger.error(f"Missing fields: {missing_fields}")
+            logger.error("Missing fields: %s", missing_fields)
             return jsonify({'error': f'Missing required fields: {", ".join(missing_fields)}'}), 400
 
         try:
             # Validate date and age
             dob = datetime.strptime(data['date_of_birth'], '%Y-%m-%d').date()
             age = calculate_age(dob)
-            logger.debug(f"Calculated age: {age}")
+            logger.debug("Calculated age: %s", age)
 
             if age < 14:
-                logger.warning(f"Invalid age: {age}")
+                logger.warning("Invalid age: %s", age)
                 return jsonify({'error': 'Devi avere almeno 14 anni per registrarti'}), 400
 
         except ValueError as e:
-            logger.error(f"Date parsing error: {str(e)}")
+            logger.error("Date parsing error: %s", e)
             return jsonify({'error': 'Invalid date format'}), 400
 
-        # Check for existing email
         from models import User, Player, db
-        if User.query.filter_by(email=data['email']).first():
-            logger.warning(f"Email already exists: {data['email']}")
-            return jsonify({'error': 'Email già registrata'}), 400
 
         try:
             # Create user
@@ -81,32 +80,39 @@ def register():
             )
             user.set_password(data['password'])
 
+            # Flush to get user.id, then commit user and player profile
+            # together so a failed profile never leaves an orphaned user
             db.session.add(user)
-            db.session.commit()
-            logger.info(f"User created: {user.email}")
+            db.session.flush()
 
             # Create player profile
             player = Player(user_id=user.id)
             db.session.add(player)
             db.session.commit()
-            logger.info(f"Player profile created for user: {user.email}")
+            logger.info("User and player profile created: %s", user.email)
 
             # Login user
             login_user(user)
-            logger.info(f"User logged in: {user.email}")
+            logger.info("User logged in: %s", user.email)
 
             return jsonify({
                 'message': 'Registrazione completata con successo',
                 'redirect': '/dashboard'
             }), 201
 
+        except IntegrityError:
+            # The unique email constraint rejects duplicates
+            db.session.rollback()
+            logger.warning("Email already exists: %s", data['email'])
+            return jsonify({'error': 'Email già registrata'}), 400
+
         except Exception as e:
-            logger.error(f"Database error: {str(e)}", exc_info=True)
+            logger.error("Database error: %s", e, exc_info=True)
             db.session.rollback()
             return jsonify({'error': 'Error creating user profile'}), 500
 
     except Exception as e:
-        logger.error(f"Registration error: {str(e)}", exc_info=True)
+        logger.error("Registration error: %s", e, exc_info=True)
         return jsonify({'error': 'Registration error occurred'}), 500
 
 # Import models and setup app context
@@ -122,25 +128,27 @@ def logout():
 def login():
     try:
         data = request.get_json()
-        logger.debug(f"Login attempt data: {data}")
+        logger.debug("Login attempt data: %s", data)
 
         if not data or 'email' not in data or 'password' not in data:
             return jsonify({'error': 'Email e password sono richiesti'}), 400
 
         user = User.query.filter_by(email=data['email']).first()
         if user and user.check_password(data['password']):
+            # Saves the hash check_password upgraded, if any
+            db.session.commit()
             login_user(user)
-            logger.info(f"Login successful: {user.email}")
+            logger.info("Login successful: %s", user.email)
             return jsonify({
                 'message': 'Login effettuato con successo',
                 'redirect': '/dashboard'
             })
 
-        logger.warning(f"Failed login attempt for email: {data.get('email')}")
+        logger.warning("Failed login attempt for email: %s", data.get('email'))
         return jsonify({'error': 'Email o password non validi'}), 401
 
     except Exception as e:
-        logger.error(f"Login error: {str(e)}", exc_info=True)
+        logger.error("Login error: %s", e, exc_info=True)
         return jsonify({'error': 'Errore durante il login'}), 500
 
 @app.context_processor
@@ -0,0 +1,145 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+
+from main import app, load_user
+from models import db, User, Player, user_cache_key, player_owner_cache_key
+
+# The fixtures create and drop every table, so never point them at a real database
+pytestmark = pytest.mark.skipif(
+    app.config["SQLALCHEMY_DATABASE_URI"] != "sqlite://",
+    reason="tests need the in-memory SQLite database"
+)
+
+
+def test_user_cache_dropped_after_commit(client, fake_redis):
+    key = user_cache_key(1)
+    with app.app_context():
+        user = db.session.get(User, 1)
+        user.team = "Rovers"
+        db.session.flush()
+        # A request that misses the cache between the flush and the commit
+        # caches the old row again; the commit must still drop it
+        fake_redis.data[key] = b"stale"
+        db.session.commit()
+    assert key not in fake_redis.data
+
+    # Rolled back changes leave the cache alone
+    with app.app_context():
+        user = db.session.get(User, 1)
+        user.team = "United"
+        db.session.flush()
+        fake_redis.data[key] = b"cached"
+        db.session.rollback()
+    assert fake_redis.data[key] == b"cached"
+
+
+def test_player_owner_cache_dropped_after_commit(client, fake_redis):
+    key = player_owner_cache_key(1)
+    with app.app_context():
+        player = db.session.get(Player, 1)
+        player.goals = 3
+        db.session.flush()
+        fake_redis.data[key] = b"1"
+        db.session.commit()
+    assert key not in fake_redis.data
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def test_load_user_cache_hit(client, fake_redis):
+    with app.app_context():
+        load_user("1")
+    assert user_cache_key(1) in fake_redis.data
+
+    with app.app_context(), count_queries() as statements:
+        user = load_user("1")
+        assert user.full_name == "Test Player"
+        assert user.email == "player@example.com"
+        assert user.age >= 18
+        assert statements == []
+
+        # The hash is not cached; checking a password loads it on demand
+        assert user.check_password("secret")
+        assert not user.check_password("wrong")
+        assert len(statements) == 1
+
+
+def test_load_user_cache_dropped_on_update(client, fake_redis):
+    with app.app_context():
+        user = load_user("1")
+        user.first_name = "Renamed"
+        db.session.commit()
+    assert user_cache_key(1) not in fake_redis.data
+
+    with app.app_context():
+        assert load_user("1").first_name == "Renamed"
+
+
+def test_load_user_ignores_malformed_cache(client, fake_redis):
+    key = user_cache_key(1)
+    for cached in (b"not json", b'{"id": 1}', b'{"id": 1, "date_of_birth": "yesterday", "created_at": null}'):
+        fake_redis.data[key] = cached
+        with app.app_context():
+            user = load_user("1")
+            assert user.email == "player@example.com"
+        # The entry is rewritten from the database
+        with app.app_context(), count_queries() as statements:
+            assert load_user("1").email == "player@example.com"
+            assert statements == []
+
+
+def test_login_upgrades_legacy_password_hash(client):
+    with app.app_context():
+        user = db.session.get(User, 1)
+        user.password_hash = generate_password_hash("secret")
+        db.session.commit()
+        legacy_hash = user.password_hash
+
+    def login(password):
+        return client.post("/login", json={"email": "player@example.com", "password": password})
+
+    assert login("wrong").status_code == 401
+    with app.app_context():
+        assert db.session.get(User, 1).password_hash == legacy_hash
+
+    assert login("secret").status_code == 200
+    with app.app_context():
+        user = db.session.get(User, 1)
+        assert user.password_hash.startswith("$argon2")
+        assert user.check_password("secret")
+
+
+def test_search_players(client, fake_redis):
+    for name, team, role in [("Marco Rossi", "Juventus", "forward"), ("Luca Bianchi", "Torino", "defender")]:
+        response = client.post("/api/players", json={"name": name, "team": team, "role": role, "goals": 3})
+        assert response.status_code == 201
+
+    def search(query):
+        response = client.get(f"/api/players/search?{query}")
+        assert response.status_code == 200
+        return [player["name"] for player in response.get_json()]
+
+    assert len(search("")) == 3
+    assert search("name=rossi") == ["Marco Rossi"]
+    assert search("team=TORINO") == ["Luca Bianchi"]
+    assert search("role=forward") == ["Marco Rossi"]
+    assert search("name=rossi&role=defender") == []
+
+    # Results are cached per filter combination
+    with app.app_context(), count_queries() as statements:
+        assert search("name=rossi") == ["Marco Rossi"]
+        assert statements == []
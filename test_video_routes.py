@@ -0,0 +1,362 @@
+import fcntl
+import io
+import os
+import re
+import time
+from datetime import datetime
+
+import pytest
+from flask import request
+
+import video_routes
+from main import app
+from models import db, Video
+
+# The fixture creates and drops every table, so never point it at a real database
+pytestmark = pytest.mark.skipif(
+    app.config["SQLALCHEMY_DATABASE_URI"] != "sqlite://",
+    reason="video route tests need the in-memory SQLite database"
+)
+
+# Smallest header that passes the container check (an MP4 'ftyp' box)
+MP4_HEADER = b'\x00\x00\x00\x18ftypmp42'
+
+
+def get_video(video_id):
+    with app.app_context():
+        return db.session.get(Video, video_id)
+
+
+def stored_bytes(filename):
+    with open(os.path.join(app.config["UPLOAD_FOLDER"], filename), "rb") as f:
+        return f.read()
+
+
+def test_upload_video_file(client):
+    data = MP4_HEADER + b"x" * 1000
+    response = client.post("/api/players/1/videos", data={
+        "title": "Goal",
+        "video": (io.BytesIO(data), "goal.mp4"),
+        "action_type": "goal",
+        "skill_rating": "4",
+        "tags": '["shot", "left foot"]'
+    }, content_type="multipart/form-data")
+
+    assert response.status_code == 201
+    video = response.get_json()["video"]
+    assert video["original_filename"] == "goal.mp4"
+    assert video["action_type"] == "goal"
+    assert video["skill_rating"] == 4
+    assert video["tags"] == ["shot", "left foot"]
+    assert stored_bytes(video["filename"]) == data
+    assert get_video(video["id"]).filesize == len(data)
+    # Stored under two levels of two-hex-digit shard directories
+    assert re.fullmatch(r"([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{28}\.mp4", video["filename"])
+
+
+def test_only_large_video_uploads_spool_to_upload_folder(client):
+    folder = app.config["UPLOAD_FOLDER"]
+
+    def file_stream(path, total_content_length):
+        with app.test_request_context(path, method="POST"):
+            return request._get_file_stream(total_content_length, "video/mp4", "goal.mp4")
+
+    for path, size in [("/api/players/1/videos", 1000), ("/login", 10_000_000)]:
+        stream = file_stream(path, size)
+        assert not isinstance(getattr(stream, "name", None), str)
+        stream.close()
+
+    stream = file_stream("/api/players/1/videos", 10_000_000)
+    assert os.path.dirname(stream.name) == folder
+    stream.close()
+
+    # A large upload is hard-linked from its spool file into place
+    data = MP4_HEADER + os.urandom(600_000)
+    response = client.post("/api/players/1/videos", data={
+        "title": "Goal",
+        "video": (io.BytesIO(data), "goal.mp4")
+    }, content_type="multipart/form-data")
+    assert response.status_code == 201
+    assert stored_bytes(response.get_json()["video"]["filename"]) == data
+    assert not [name for name in os.listdir(folder) if name.startswith(".tmp-")]
+
+
+def test_upload_rejects_non_video(client):
+    before = sorted(os.listdir(app.config["UPLOAD_FOLDER"]))
+    response = client.post("/api/players/1/videos", data={
+        "title": "Goal",
+        "video": (io.BytesIO(b"not a video" * 100), "goal.mp4")
+    }, content_type="multipart/form-data")
+    assert response.status_code == 400
+
+    response = client.post("/api/players/1/videos/stream?title=Goal&filename=goal.mp4",
+                           data=b"not a video" * 100, content_type="application/octet-stream")
+    assert response.status_code == 400
+
+    # Rejected files are not kept and no video is created
+    assert [f for f in os.listdir(app.config["UPLOAD_FOLDER"]) if f not in before
+            and os.path.isfile(os.path.join(app.config["UPLOAD_FOLDER"], f))] == []
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count(Video.id))) == 0
+
+
+def test_upload_video_youtube_url(client):
+    response = client.post("/api/players/1/videos", data={
+        "title": "Match",
+        "source_type": "url",
+        "video_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42",
+        "skill_rating": "3"
+    })
+
+    assert response.status_code == 201
+    video = response.get_json()["video"]
+    assert video["type"] == "youtube"
+    assert video["youtube_id"] == "dQw4w9WgXcQ"
+    assert video["skill_rating"] == 3
+
+    # Ids longer than 11 characters are rejected, not truncated
+    response = client.post("/api/players/1/videos", data={
+        "title": "Match",
+        "source_type": "url",
+        "video_url": "https://www.youtube.com/watch?v=abcdefghijkLMN"
+    })
+    assert response.status_code == 400
+
+
+def test_upload_video_stream(client):
+    data = MP4_HEADER + os.urandom(100_000)
+    response = client.post(
+        "/api/players/1/videos/stream?title=Dribble&filename=dribble.webm&action_type=dribble&skill_rating=5",
+        data=data,
+        content_type="application/octet-stream"
+    )
+
+    assert response.status_code == 201
+    video = response.get_json()["video"]
+    assert video["original_filename"] == "dribble.webm"
+    assert video["action_type"] == "dribble"
+    assert video["skill_rating"] == 5
+    assert stored_bytes(video["filename"]) == data
+    assert get_video(video["id"]).filesize == len(data)
+
+
+def test_chunked_upload(client):
+    data = MP4_HEADER + os.urandom(250_000)
+    response = client.post("/api/uploads", json={
+        "player_id": 1,
+        "title": "Assist",
+        "filename": "assist.mp4",
+        "size": len(data),
+        "action_type": "assist",
+        "skill_rating": 2
+    })
+    assert response.status_code == 201
+    upload_id = response.get_json()["upload_id"]
+
+    def send(start, stop):
+        return client.patch(f"/api/uploads/{upload_id}", data=data[start:stop], headers={
+            "Content-Range": f"bytes {start}-{stop - 1}/{len(data)}"
+        })
+
+    response = send(0, 100_000)
+    assert response.status_code == 200
+    assert response.get_json()["offset"] == 100_000
+
+    # A chunk that does not continue from the stored offset is refused
+    response = send(0, 100_000)
+    assert response.status_code == 409
+    assert response.get_json()["offset"] == 100_000
+    assert client.get(f"/api/uploads/{upload_id}").get_json()["offset"] == 100_000
+
+    response = send(100_000, len(data))
+    assert response.status_code == 201
+    video = response.get_json()["video"]
+    assert video["original_filename"] == "assist.mp4"
+    assert video["action_type"] == "assist"
+    assert video["skill_rating"] == 2
+    assert stored_bytes(video["filename"]) == data
+    assert get_video(video["id"]).filesize == len(data)
+
+    # The finished upload's resume state is gone
+    assert client.get(f"/api/uploads/{upload_id}").status_code == 404
+
+
+def test_chunked_upload_validates_metadata(client):
+    base = {"player_id": 1, "title": "Assist", "filename": "assist.mp4", "size": 1000}
+    for bad in ({"skill_rating": "high"}, {"action_type": "x" * 51}, {"title": "x" * 201}):
+        response = client.post("/api/uploads", json={**base, **bad})
+        assert response.status_code == 400
+    assert client.post("/api/uploads", json={**base, "size": True}).status_code == 400
+    assert client.post("/api/uploads", json={**base, "skill_rating": True}).status_code == 400
+    for player_id in ("1", True):
+        response = client.post("/api/uploads", json={**base, "player_id": player_id})
+        assert response.status_code == 404
+
+
+def test_chunked_upload_resumes_after_failed_insert(client, monkeypatch):
+    data = MP4_HEADER + os.urandom(50_000)
+    upload_id = client.post("/api/uploads", json={
+        "player_id": 1, "title": "Assist", "filename": "assist.mp4", "size": len(data)
+    }).get_json()["upload_id"]
+
+    def send(start, stop):
+        return client.patch(f"/api/uploads/{upload_id}", data=data[start:stop], headers={
+            "Content-Range": f"bytes {start}-{stop - 1}/{len(data)}"
+        })
+
+    assert send(0, 20_000).status_code == 200
+
+    insert_video = video_routes.insert_video
+
+    def fail(**fields):
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(video_routes, "insert_video", fail)
+    assert send(20_000, len(data)).status_code == 500
+
+    # The last chunk is dropped so it can be sent again
+    assert client.get(f"/api/uploads/{upload_id}").get_json()["offset"] == 20_000
+    monkeypatch.setattr(video_routes, "insert_video", insert_video)
+    response = send(20_000, len(data))
+    assert response.status_code == 201
+    assert stored_bytes(response.get_json()["video"]["filename"]) == data
+
+
+def test_chunked_upload_checks_chunks(client):
+    data = MP4_HEADER + os.urandom(50_000)
+    upload_id = client.post("/api/uploads", json={
+        "player_id": 1, "title": "Assist", "filename": "assist.mp4", "size": len(data)
+    }).get_json()["upload_id"]
+
+    def send(body, start, stop):
+        return client.patch(f"/api/uploads/{upload_id}", data=body, headers={
+            "Content-Range": f"bytes {start}-{stop - 1}/{len(data)}"
+        })
+
+    # Ranges without a start, or in other units, are not chunks
+    for header in (f"bytes */{len(data)}", f"items 0-9/{len(data)}"):
+        response = client.patch(f"/api/uploads/{upload_id}", data=data[:10],
+                                headers={"Content-Range": header})
+        assert response.status_code == 400
+
+    # Bodies shorter or longer than their Content-Range store nothing
+    assert send(data[:10_000], 0, 20_000).status_code == 400
+    assert send(data[:30_000], 0, 20_000).status_code == 413
+    assert client.get(f"/api/uploads/{upload_id}").get_json()["offset"] == 0
+
+    # A chunk arriving while another is being stored is refused
+    part_path = os.path.join(app.config["UPLOAD_FOLDER"], f"{upload_id}.part")
+    with open(part_path, "rb") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        response = send(data[:20_000], 0, 20_000)
+    assert response.status_code == 409
+    assert response.get_json()["offset"] == 0
+
+    assert send(data[:20_000], 0, 20_000).status_code == 200
+
+    # While the finished file is being moved into place the metadata is
+    # still there but the .part is not; polls and retries get a 409
+    os.rename(part_path, part_path + ".moving")
+    assert client.get(f"/api/uploads/{upload_id}").status_code == 409
+    assert send(data[20_000:], 20_000, len(data)).status_code == 409
+    os.rename(part_path + ".moving", part_path)
+
+    assert send(data[20_000:], 20_000, len(data)).status_code == 201
+
+
+def test_stale_uploads_expire(client, monkeypatch):
+    folder = app.config["UPLOAD_FOLDER"]
+    old = time.time() - video_routes.UPLOAD_EXPIRY - 60
+    for name in ["stale.part", "stale.json", "orphan.json", ".tmp-stale", "fresh.part", "fresh.json"]:
+        open(os.path.join(folder, name), "wb").close()
+        if not name.startswith("fresh"):
+            os.utime(os.path.join(folder, name), (old, old))
+
+    monkeypatch.setattr(video_routes, "_last_upload_sweep", 0)
+    response = client.post("/api/uploads", json={
+        "player_id": 1, "title": "Assist", "filename": "assist.mp4", "size": 1000
+    })
+    assert response.status_code == 201
+    upload_id = response.get_json()["upload_id"]
+    assert sorted(os.listdir(folder)) == sorted(["fresh.part", "fresh.json", f"{upload_id}.part", f"{upload_id}.json"])
+
+
+def add_videos(count, upload_date):
+    with app.app_context():
+        db.session.add_all(Video(title=f"Clip {i}", video_type="youtube", youtube_id="dQw4w9WgXcQ",
+                                 upload_date=upload_date, player_id=1, user_id=1)
+                           for i in range(count))
+        db.session.commit()
+
+
+def test_player_videos_keyset_pages(client):
+    # Rows sharing one timestamp are still paged without gaps or repeats
+    add_videos(5, datetime(2024, 5, 1, 12, 0))
+    ids, pages, cursor = [], [], None
+    while True:
+        query = "limit=2" + (f"&before={cursor}" if cursor else "")
+        page = client.get(f"/api/players/1/videos?{query}").get_json()
+        pages.append(len(page["videos"]))
+        ids += [video["id"] for video in page["videos"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == [2, 2, 1]
+    assert ids == [5, 4, 3, 2, 1]
+
+    assert client.get("/api/players/1/videos?before=garbage").status_code == 400
+    assert client.get("/api/players/1/videos?before=2024-05-01T12:00:00_x").status_code == 400
+
+
+def test_player_videos_limit_clamped(client, monkeypatch):
+    add_videos(5, datetime(2024, 5, 1, 12, 0))
+    monkeypatch.setattr(video_routes, "MAX_VIDEO_PAGE_SIZE", 3)
+    assert len(client.get("/api/players/1/videos?limit=0").get_json()["videos"]) == 1
+    assert len(client.get("/api/players/1/videos?limit=1000").get_json()["videos"]) == 3
+
+
+def test_upload_video_stream_size_limits(client, monkeypatch):
+    # The streamed endpoint is not bound by the 16 MB multipart limit
+    data = MP4_HEADER + b"\0" * (app.config["MAX_CONTENT_LENGTH"] + 1)
+    response = client.post("/api/players/1/videos/stream?title=Match&filename=match.mp4",
+                           data=data, content_type="application/octet-stream")
+    assert response.status_code == 201
+    assert get_video(response.get_json()["video"]["id"]).filesize == len(data)
+
+    # Bodies over its own limit get a 413, not a 500, and leave no file behind
+    monkeypatch.setattr(video_routes, "MAX_UPLOAD_SIZE", 1000)
+    before = sorted(os.listdir(app.config["UPLOAD_FOLDER"]))
+    response = client.post("/api/players/1/videos/stream?title=Match&filename=match.mp4",
+                           data=MP4_HEADER + b"\0" * 1000, content_type="application/octet-stream")
+    assert response.status_code == 413
+    assert sorted(os.listdir(app.config["UPLOAD_FOLDER"])) == before
+
+
+def test_upload_video_file_too_large(client):
+    response = client.post("/api/players/1/videos", data={
+        "title": "Match",
+        "video": (io.BytesIO(b"\0" * (app.config["MAX_CONTENT_LENGTH"] + 1)), "match.mp4")
+    }, content_type="multipart/form-data")
+    assert response.status_code == 413
+
+
+def test_player_videos_cache_skips_stale_pages(client, fake_redis):
+
+    def upload(title):
+        response = client.post("/api/players/1/videos", data={
+            "title": title, "source_type": "url", "video_url": "https://youtu.be/dQw4w9WgXcQ"
+        })
+        assert response.status_code == 201
+
+    def titles(response):
+        return [video["title"] for video in response.get_json()["videos"]]
+
+    upload("First")
+    assert titles(client.get("/api/players/1/videos")) == ["First"]
+
+    # A listing that read its rows before an upload, but finishes streaming
+    # after it, must not leave its page in the cache
+    fake_redis.data.clear()
+    stale = client.get("/api/players/1/videos", buffered=False)
+    upload("Second")
+    assert titles(stale) == ["First"]
+    assert titles(client.get("/api/players/1/videos")) == ["Second", "First"]
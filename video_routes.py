@@ -1,14 +1,23 @@
+import fcntl
 import os
+import re
+import secrets
+import tempfile
 import requests
-import traceback
 import time
-from flask import Blueprint, request, jsonify, current_app, send_from_directory
+import uuid
+from datetime import datetime
+from flask import Blueprint, Request, Response, request, jsonify, current_app, send_from_directory, stream_with_context
 from flask_login import login_required, current_user
-from werkzeug.utils import secure_filename
-from models import db, Video, Player
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_content_range_header
+from models import db, Video, Player, player_owner_cache_key
+from cache import get_cached, set_cached, incr_cached, tee_to_cache
+from responses import ojsonify, stream_json_array
 import logging
-import magic
-from urllib.parse import urlparse, parse_qs
+import mimetypes
+import orjson
+from urllib.parse import quote
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,51 +27,268 @@ video_bp = Blueprint('video', __name__)
 
 # Configure upload settings
 ALLOWED_EXTENSIONS = {'mp4', 'webm', 'ogg'}
-ALLOWED_MIME_TYPES = {
-    'video/mp4',
-    'video/webm',
-    'video/ogg',
-    'application/octet-stream'  # Some video files might be detected as this
-}
+# Block size used when copying a streamed upload body to disk
+STREAM_BUFFER_SIZE = 4 * 1024 * 1024
+# Multipart bodies up to this size keep Werkzeug's in-memory file parts
+UPLOAD_SPOOL_THRESHOLD = 500 * 1024
+# Largest video accepted through the streamed and chunked upload APIs; the
+# app-wide MAX_CONTENT_LENGTH still applies to multipart uploads
+MAX_UPLOAD_SIZE = 4 * 1024 * 1024 * 1024
+# Lifetime (seconds) of a player's cached video list; uploads invalidate it
+PLAYER_VIDEOS_CACHE_TTL = 3600
+# Default and largest page sizes of the player video list
+VIDEO_PAGE_SIZE = 50
+MAX_VIDEO_PAGE_SIZE = 200
+# Lifetime (seconds) of a cached player owner lookup
+PLAYER_OWNER_CACHE_TTL = 86400
+# Chunked uploads and temp files untouched for this long (seconds) are
+# deleted, checked at most once per UPLOAD_SWEEP_INTERVAL in each process
+UPLOAD_EXPIRY = 86400
+UPLOAD_SWEEP_INTERVAL = 3600
+_last_upload_sweep = 0
+
+def player_videos_generation_key(player_id):
+    return f"player:{player_id}:videos:gen"
+
+def player_videos_cache_key(player_id, generation):
+    return f"player:{player_id}:videos:{generation}"
+
+def invalidate_player_videos(player_id):
+    """Retire a player's cached video list after its videos change
+
+    The cached page is keyed by a per-player generation that this bumps.
+    A listing that read the old rows before the change and finishes
+    streaming after it still caches its page under the old generation,
+    where no request will look.
+    """
+    incr_cached(player_videos_generation_key(player_id))
+
+def get_player_owner(player_id):
+    """Return the id of the user owning a player, or None if it doesn't exist"""
+    # Ownership almost never changes, so it is cached to spare every video
+    # request a SELECT on player
+    cache_key = player_owner_cache_key(player_id)
+    cached = get_cached(cache_key)
+    if cached is not None:
+        return int(cached)
+    owner_id = db.session.query(Player.user_id).filter_by(id=player_id).scalar()
+    if owner_id is not None:
+        set_cached(cache_key, owner_id, PLAYER_OWNER_CACHE_TTL)
+    return owner_id
+
+@video_bp.record_once
+def init_upload_folder(state):
+    # Resolve and create the upload folder once when the blueprint is
+    # registered rather than checking the filesystem on every request
+    app = state.app
+    upload_folder = app.config.setdefault('UPLOAD_FOLDER', os.path.join(app.root_path, 'uploads'))
+    os.makedirs(upload_folder, exist_ok=True)
+    # Internal nginx location aliased to the upload folder, e.g.
+    # `location /internal/uploads/ { internal; alias /app/uploads/; }`
+    app.config.setdefault('UPLOAD_ACCEL_REDIRECT', os.environ.get('UPLOAD_ACCEL_REDIRECT'))
 
 def get_upload_folder():
-    upload_folder = os.path.join(current_app.root_path, 'uploads')
-    if not os.path.exists(upload_folder):
-        os.makedirs(upload_folder)
-    return upload_folder
+    return current_app.config['UPLOAD_FOLDER']
+
+class UploadRequest(Request):
+    """Request that spools large video uploads inside the upload folder"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Werkzeug keeps parts up to 500 KB in memory and spools bigger ones
+        # to a temp file elsewhere, which FileStorage.save() then copies
+        # again. For large uploads to this blueprint a temp file next to the
+        # destination lets store_upload() hard-link it into place instead;
+        # everything else keeps the default handling.
+        if self.blueprint != video_bp.name or (
+                total_content_length is not None and total_content_length <= UPLOAD_SPOOL_THRESHOLD):
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        return tempfile.NamedTemporaryFile('wb+', dir=get_upload_folder(), prefix='.tmp-')
+
+def store_upload(file, file_path):
+    """Put an uploaded file at file_path, without copying it when possible
+
+    Returns the file size, read from the upload stream's end position so
+    no extra stat of the stored file is needed.
+    """
+    spooled_path = getattr(file.stream, 'name', None)
+    if not isinstance(spooled_path, str):
+        file.save(file_path)
+        return file.stream.seek(0, os.SEEK_END)
+    file.stream.flush()
+    # The spooled file itself is removed when the request closes its files
+    os.link(spooled_path, file_path)
+    return file.stream.seek(0, os.SEEK_END)
+
+def copy_stream(src, dst):
+    """Copy src to dst in STREAM_BUFFER_SIZE blocks, returning the byte count"""
+    total = 0
+    while chunk := src.read(STREAM_BUFFER_SIZE):
+        dst.write(chunk)
+        total += len(chunk)
+    return total
+
+def has_video_signature(header):
+    """Check the leading bytes of a file for an MP4, WebM/Matroska or Ogg container"""
+    return (
+        header[4:8] == b'ftyp'               # MP4 / QuickTime
+        or header[:4] == b'\x1aE\xdf\xa3'   # EBML (WebM, Matroska)
+        or header[:4] == b'OggS'             # Ogg
+    )
+
+def is_video_file(file_path):
+    """Check that a stored upload starts with a supported container header"""
+    # Reads 12 bytes, so it is cheap enough to run before the upload returns
+    with open(file_path, 'rb') as f:
+        return has_video_signature(f.read(12))
+
+def upload_paths(upload_id):
+    """Return the data and metadata file paths of a chunked upload"""
+    upload_folder = get_upload_folder()
+    return (
+        os.path.join(upload_folder, f"{upload_id}.part"),
+        os.path.join(upload_folder, f"{upload_id}.json")
+    )
+
+def expire_stale_uploads():
+    """Delete abandoned chunked uploads and leftover upload temp files"""
+    global _last_upload_sweep
+    now = time.time()
+    if now - _last_upload_sweep < UPLOAD_SWEEP_INTERVAL:
+        return
+    _last_upload_sweep = now
+
+    cutoff = now - UPLOAD_EXPIRY
+    upload_folder = get_upload_folder()
+    with os.scandir(upload_folder) as entries:
+        for entry in entries:
+            name = entry.name
+            try:
+                if not entry.is_file() or entry.stat().st_mtime >= cutoff:
+                    continue
+                if name.endswith('.part'):
+                    # The .part is written on every chunk, so its age is
+                    # the time since the upload last made progress
+                    os.remove(entry.path)
+                    os.remove(os.path.join(upload_folder, name[:-5] + '.json'))
+                elif name.endswith('.json'):
+                    if os.path.exists(os.path.join(upload_folder, name[:-5] + '.part')):
+                        continue
+                    os.remove(entry.path)
+                elif name.startswith('.tmp-'):
+                    os.remove(entry.path)
+                else:
+                    continue
+                logger.info("Deleted stale upload file %s", name)
+            except FileNotFoundError:
+                pass
+
+def load_upload(upload_id):
+    """Return a chunked upload's metadata if it exists and is the user's"""
+    # Upload ids are uuid4 hex strings; anything else never touches the disk
+    try:
+        if uuid.UUID(hex=upload_id).hex != upload_id:
+            return None
+    except ValueError:
+        return None
+    _, meta_path = upload_paths(upload_id)
+    try:
+        with open(meta_path, 'rb') as f:
+            upload = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    return upload if upload['user_id'] == current_user.id else None
+
+def insert_video(**fields):
+    """Insert a video with one INSERT ... RETURNING and return the new row
+
+    The returned Video is loaded from the RETURNING clause, so its id and
+    defaulted columns are available without a flush or a follow-up SELECT.
+    """
+    return db.session.scalars(db.insert(Video).values(**fields).returning(Video)).one()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def is_youtube_url(url):
-    parsed = urlparse(url)
-    if 'youtube.com' in parsed.netloc:
-        return 'v' in parse_qs(parsed.query)
-    elif 'youtu.be' in parsed.netloc:
-        return bool(parsed.path[1:])
-    return False
+def storage_filename(filename):
+    """Return a random, collision-free name to store an upload under
+
+    The client's filename is only kept in Video.original_filename, so it
+    never has to be sanitized for use on disk.
+    """
+    name = f"{secrets.token_hex(16)}.{filename.rsplit('.', 1)[1].lower()}"
+    # Shard into two hex directory levels (ab/cd/abcd..., 256 x 256) so no
+    # single directory grows large enough to slow down lookups and creates;
+    # hex names also stay distinct on case-insensitive filesystems. The
+    # relative path is what Video.filename stores; older uploads sit
+    # directly in the folder.
+    return f"{name[:2]}/{name[2:4]}/{name}"
+
+def upload_file_path(filename):
+    """Return the absolute path to write an upload to, creating its shard directory"""
+    file_path = os.path.join(get_upload_folder(), filename)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    return file_path
+
+def is_int(value):
+    """Check for a JSON integer; bool is an int subclass but JSON true is not a number"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def parse_tags(value):
+    """Return a list of tags from a JSON array or a comma-separated string"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = orjson.loads(value) if value.lstrip().startswith('[') else value.split(',')
+    if not isinstance(value, list) or not all(isinstance(tag, str) for tag in value):
+        raise ValueError('Tags must be a list of strings')
+    return [tag.strip() for tag in value if tag.strip()]
+
+def parse_video_metadata(values):
+    """Read the optional metadata fields from form data or query args"""
+    return {
+        'action_type': values.get('action_type'),
+        'skill_rating': values.get('skill_rating', type=int),
+        'tags': parse_tags(values.get('tags')),
+        'notes': values.get('notes', '')
+    }
+
+def video_to_dict(video):
+    return {
+        'id': video.id,
+        'title': video.title,
+        'type': video.video_type,
+        'youtube_id': video.youtube_id if video.video_type == 'youtube' else None,
+        'filename': video.filename if video.video_type == 'file' else None,
+        'original_filename': video.original_filename if video.video_type == 'file' else None,
+        'upload_date': video.upload_date,
+        'action_type': video.action_type,
+        'skill_rating': video.skill_rating,
+        'tags': video.tags,
+        'notes': video.notes
+    }
+
+# Matches youtu.be/<id> and (www., m., ...)youtube.com/watch?...v=<id>; the id
+# must be exactly 11 characters, so longer values are rejected, not truncated
+_YT_RE = re.compile(r'(?:https?://)?(?:[\w-]+\.)*(?:youtu\.be/|youtube\.com/watch\?(?:[^#]*&)?v=)([\w-]{11})(?=$|[&#?/])')
 
 def get_youtube_video_id(url):
-    parsed = urlparse(url)
-    if 'youtube.com' in parsed.netloc:
-        query = parse_qs(parsed.query)
-        return query.get('v', [None])[0]
-    elif 'youtu.be' in parsed.netloc:
-        return parsed.path[1:]
-    return None
+    """Return the 11-character video id of a YouTube URL, or None"""
+    match = _YT_RE.match(url)
+    return match.group(1) if match else None
 
 @video_bp.route('/api/players/<int:player_id>/videos', methods=['POST'])
 @login_required
 def upload_video(player_id):
     try:
-        logger.debug(f"Video upload requested for player {player_id}")
-        logger.debug(f"Form data: {request.form}")
-        logger.debug(f"Files: {request.files}")
+        logger.debug("Video upload requested for player %s", player_id)
+        # Formatting the form and files is skipped unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Form data: %s", request.form)
+            logger.debug("Files: %s", request.files)
 
         # Check if player exists and belongs to current user
-        player = Player.query.filter_by(id=player_id, user_id=current_user.id).first()
-        if not player:
-            logger.warning(f"Player {player_id} not found or unauthorized for user {current_user.id}")
+        if get_player_owner(player_id) != current_user.id:
+            logger.warning("Player %s not found or unauthorized for user %s", player_id, current_user.id)
             return jsonify({'error': 'Player not found or unauthorized'}), 404
 
         # Get basic video info
@@ -75,10 +301,10 @@ def upload_video(player_id):
         file_path = None
 
         # Get video metadata
-        action_type = request.form.get('action_type')
-        skill_rating = request.form.get('skill_rating', type=int)
-        tags = request.form.get('tags', '').split(',') if request.form.get('tags') else []
-        notes = request.form.get('notes', '')
+        try:
+            metadata = parse_video_metadata(request.form)
+        except ValueError:
+            return jsonify({'error': 'Invalid tags'}), 400
 
         try:
             if source_type == 'file':
@@ -93,23 +319,24 @@ def upload_video(player_id):
                 if not allowed_file(file.filename):
                     return jsonify({'error': 'File type not allowed'}), 400
 
-                filename = secure_filename(file.filename)
-                file_path = os.path.join(get_upload_folder(), filename)
-                logger.debug(f"Saving file to: {file_path}")
-                file.save(file_path)
+                filename = storage_filename(file.filename)
+                file_path = upload_file_path(filename)
+                logger.debug("Saving file to: %s", file_path)
+                filesize = store_upload(file, file_path)
+                if not is_video_file(file_path):
+                    os.remove(file_path)
+                    return jsonify({'error': 'File is not a supported video'}), 400
 
                 # Create video record for file
-                video = Video(
+                video = insert_video(
                     title=request.form['title'],
                     filename=filename,
+                    original_filename=file.filename[:255],
                     video_type='file',
                     player_id=player_id,
                     user_id=current_user.id,
-                    filesize=os.path.getsize(file_path),
-                    action_type=action_type,
-                    skill_rating=skill_rating,
-                    tags=tags,
-                    notes=notes
+                    filesize=filesize,
+                    **metadata
                 )
 
             else:  # source_type == 'url'
@@ -118,61 +345,313 @@ def upload_video(player_id):
                     return jsonify({'error': 'No video URL provided'}), 400
 
                 video_url = request.form['video_url']
-                if not is_youtube_url(video_url):
-                    return jsonify({'error': 'Only YouTube URLs are supported'}), 400
-
                 youtube_id = get_youtube_video_id(video_url)
                 if not youtube_id:
-                    return jsonify({'error': 'Invalid YouTube URL'}), 400
+                    return jsonify({'error': 'Only YouTube URLs are supported'}), 400
 
                 # Create video record for YouTube
-                video = Video(
+                video = insert_video(
                     title=request.form['title'],
                     video_url=video_url,
                     video_type='youtube',
                     youtube_id=youtube_id,
                     player_id=player_id,
                     user_id=current_user.id,
-                    action_type=action_type,
-                    skill_rating=skill_rating,
-                    tags=tags,
-                    notes=notes
+                    **metadata
                 )
 
-            db.session.add(video)
             db.session.commit()
+            invalidate_player_videos(player_id)
 
-            logger.info(f"Video record created successfully: {video.id}")
-            response = jsonify({
+            logger.info("Video record created successfully: %s", video.id)
+            return ojsonify({
                 'message': 'Video added successfully',
-                'video': {
-                    'id': video.id,
-                    'title': video.title,
-                    'type': video.video_type,
-                    'youtube_id': video.youtube_id if video.video_type == 'youtube' else None,
-                    'filename': video.filename if video.video_type == 'file' else None,
-                    'upload_date': video.upload_date.isoformat(),
-                    'action_type': video.action_type,
-                    'skill_rating': video.skill_rating,
-                    'tags': video.tags,
-                    'notes': video.notes
-                }
-            })
-            response.headers['Content-Type'] = 'application/json'
-            return response, 201
+                'video': video_to_dict(video)
+            }), 201
 
         except Exception as e:
             if file_path and os.path.exists(file_path):
                 os.remove(file_path)
-            error_msg = f"Error during video processing: {repr(e)}\n{traceback.format_exc()}"
-            logger.error(error_msg)
+            logger.error("Error during video processing: %r", e, exc_info=True)
             return jsonify({'error': str(e) or 'An unexpected error occurred during video processing'}), 500
 
+    except HTTPException:
+        # e.g. 413 from a multipart body over MAX_CONTENT_LENGTH
+        raise
+    except Exception as e:
+        logger.error("Error uploading video: %r", e, exc_info=True)
+        return jsonify({'error': str(e) or 'An unexpected error occurred during upload'}), 500
+
+@video_bp.route('/api/players/<int:player_id>/videos/stream', methods=['POST'])
+@login_required
+def upload_video_stream(player_id):
+    """Store a video sent as a raw request body (application/octet-stream).
+
+    The body is copied straight from the socket to disk in large blocks
+    instead of going through the multipart parser, which is CPU bound on
+    large files. The file name, title and optional metadata fields of
+    upload_video are passed in the query string.
+    """
+    # Lift the app-wide MAX_CONTENT_LENGTH meant for multipart forms
+    request.max_content_length = MAX_UPLOAD_SIZE
+    file_path = None
+    try:
+        logger.debug("Streamed video upload requested for player %s", player_id)
+
+        # Check if player exists and belongs to current user
+        if get_player_owner(player_id) != current_user.id:
+            logger.warning("Player %s not found or unauthorized for user %s", player_id, current_user.id)
+            return jsonify({'error': 'Player not found or unauthorized'}), 404
+
+        title = request.args.get('title')
+        if not title:
+            return jsonify({'error': 'Video title is required'}), 400
+
+        original_filename = request.args.get('filename', '')
+        if not allowed_file(original_filename):
+            return jsonify({'error': 'File type not allowed'}), 400
+
+        try:
+            metadata = parse_video_metadata(request.args)
+        except ValueError:
+            return jsonify({'error': 'Invalid tags'}), 400
+
+        # Opening the stream rejects a declared Content-Length over the limit
+        # before anything is written
+        body = request.stream
+        filename = storage_filename(original_filename)
+        file_path = upload_file_path(filename)
+        logger.debug("Streaming file to: %s", file_path)
+        with open(file_path, 'wb') as f:
+            filesize = copy_stream(body, f)
+        if not is_video_file(file_path):
+            os.remove(file_path)
+            return jsonify({'error': 'File is not a supported video'}), 400
+
+        video = insert_video(
+            title=title,
+            filename=filename,
+            original_filename=original_filename[:255],
+            video_type='file',
+            player_id=player_id,
+            user_id=current_user.id,
+            filesize=filesize,
+            **metadata
+        )
+        db.session.commit()
+        invalidate_player_videos(player_id)
+
+        logger.info("Video record created successfully: %s", video.id)
+        return ojsonify({
+            'message': 'Video added successfully',
+            'video': video_to_dict(video)
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+        if isinstance(e, HTTPException):
+            raise
+        logger.error("Error streaming video upload: %r", e, exc_info=True)
+        return jsonify({'error': str(e) or 'An unexpected error occurred during upload'}), 500
+
+@video_bp.route('/api/uploads', methods=['POST'])
+@login_required
+def create_upload():
+    """Start a chunked upload of a video file.
+
+    Large videos are sent as a series of PATCH requests (5-10 MB each is a
+    good size) carrying a Content-Range header, so an interrupted upload
+    can resume from the last stored byte instead of starting over. The JSON
+    body holds player_id, title, filename, size (total bytes) and the
+    optional metadata fields of upload_video.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data or not all(data.get(key) for key in ['player_id', 'title', 'filename', 'size']):
+            return jsonify({'error': 'Missing required fields'}), 400
+
+        # Check everything the final INSERT needs now, so a finished upload
+        # cannot fail to become a video
+        if not is_int(data['player_id']) or get_player_owner(data['player_id']) != current_user.id:
+            return jsonify({'error': 'Player not found or unauthorized'}), 404
+
+        if not isinstance(data['title'], str) or len(data['title']) > 200:
+            return jsonify({'error': 'Invalid title'}), 400
+
+        action_type = data.get('action_type')
+        skill_rating = data.get('skill_rating')
+        notes = data.get('notes', '')
+        if (action_type is not None and (not isinstance(action_type, str) or len(action_type) > 50)
+                or skill_rating is not None and not is_int(skill_rating)
+                or not isinstance(notes, str)):
+            return jsonify({'error': 'Invalid video metadata'}), 400
+
+        if not isinstance(data['filename'], str) or not allowed_file(data['filename']):
+            return jsonify({'error': 'File type not allowed'}), 400
+
+        size = data['size']
+        if not is_int(size) or size <= 0 or size > MAX_UPLOAD_SIZE:
+            return jsonify({'error': 'Invalid file size'}), 400
+
+        try:
+            tags = parse_tags(data.get('tags'))
+        except ValueError:
+            return jsonify({'error': 'Invalid tags'}), 400
+
+        expire_stale_uploads()
+
+        upload_id = uuid.uuid4().hex
+        upload = {
+            'user_id': current_user.id,
+            'player_id': data['player_id'],
+            'title': data['title'],
+            'filename': data['filename'][:255],
+            'size': size,
+            'action_type': action_type,
+            'skill_rating': skill_rating,
+            'tags': tags,
+            'notes': notes
+        }
+        part_path, meta_path = upload_paths(upload_id)
+        with open(meta_path, 'wb') as f:
+            f.write(orjson.dumps(upload))
+        open(part_path, 'wb').close()
+
+        logger.info("Chunked upload %s started for player %s", upload_id, data['player_id'])
+        return ojsonify({'upload_id': upload_id, 'offset': 0}), 201
+
     except Exception as e:
-        error_msg = f"Error uploading video: {repr(e)}\n{traceback.format_exc()}"
-        logger.error(error_msg)
+        logger.error("Error starting chunked upload: %s", e, exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+@video_bp.route('/api/uploads/<upload_id>', methods=['GET'])
+@login_required
+def get_upload(upload_id):
+    """Report how many bytes of a chunked upload are stored, for resuming"""
+    upload = load_upload(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    part_path, _ = upload_paths(upload_id)
+    try:
+        offset = os.path.getsize(part_path)
+    except FileNotFoundError:
+        # The last chunk is being turned into a video right now
+        return jsonify({'error': 'Upload is being completed'}), 409
+    return ojsonify({'upload_id': upload_id, 'offset': offset, 'size': upload['size']})
+
+@video_bp.route('/api/uploads/<upload_id>', methods=['PATCH'])
+@login_required
+def append_upload(upload_id):
+    """Append one Content-Range chunk; the last chunk creates the video"""
+    try:
+        upload = load_upload(upload_id)
+        if upload is None:
+            return jsonify({'error': 'Upload not found'}), 404
+
+        content_range = parse_content_range_header(request.headers.get('Content-Range'))
+        # "bytes */<size>" carries no data and is not accepted as a chunk
+        if (content_range is None or content_range.units != 'bytes'
+                or content_range.start is None or content_range.length != upload['size']):
+            return jsonify({'error': 'Invalid Content-Range header'}), 400
+
+        # A body longer than the range is refused with a 413 before any of
+        # it is stored
+        chunk_size = content_range.stop - content_range.start
+        request.max_content_length = chunk_size
+        body = request.stream
+
+        part_path, _ = upload_paths(upload_id)
+        try:
+            f = open(part_path, 'r+b')
+        except FileNotFoundError:
+            return jsonify({'error': 'Upload is being completed'}), 409
+        with f:
+            # Serialize requests for the same upload: a retried chunk racing
+            # the original would otherwise be appended twice. The lock is
+            # held until the upload is finished or this chunk is stored.
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return ojsonify({
+                    'error': 'Another chunk of this upload is being stored',
+                    'offset': os.fstat(f.fileno()).st_size
+                }), 409
+
+            offset = os.fstat(f.fileno()).st_size
+            if content_range.start != offset:
+                # Chunks must arrive in order; tell the client where to resume
+                return ojsonify({'error': 'Chunk does not start at the current offset', 'offset': offset}), 409
+
+            f.seek(offset)
+            try:
+                written = copy_stream(body, f)
+            except Exception:
+                f.truncate(offset)
+                raise
+            if written != chunk_size:
+                f.truncate(offset)
+                return ojsonify({'error': 'Chunk length does not match Content-Range', 'offset': offset}), 400
+            f.flush()
+            offset += written
+
+            if offset < upload['size']:
+                return ojsonify({'upload_id': upload_id, 'offset': offset})
+
+            return complete_upload(upload_id, upload, content_range.start)
+
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise
+        db.session.rollback()
+        logger.error("Error storing upload chunk: %r", e, exc_info=True)
         return jsonify({'error': str(e) or 'An unexpected error occurred during upload'}), 500
 
+def complete_upload(upload_id, upload, last_chunk_start):
+    """Check a fully received chunked upload, move it into place and create its video"""
+    part_path, meta_path = upload_paths(upload_id)
+    if not is_video_file(part_path):
+        os.remove(part_path)
+        os.remove(meta_path)
+        return jsonify({'error': 'File is not a supported video'}), 400
+
+    filename = storage_filename(upload['filename'])
+    file_path = upload_file_path(filename)
+    try:
+        video = insert_video(
+            title=upload['title'],
+            filename=filename,
+            original_filename=upload['filename'],
+            video_type='file',
+            player_id=upload['player_id'],
+            user_id=current_user.id,
+            filesize=upload['size'],
+            action_type=upload['action_type'],
+            skill_rating=upload['skill_rating'],
+            tags=upload['tags'],
+            notes=upload['notes']
+        )
+        os.replace(part_path, file_path)
+        try:
+            db.session.commit()
+        except Exception:
+            os.replace(file_path, part_path)
+            raise
+    except Exception:
+        # Keep the upload resumable: drop the last chunk so the client can
+        # send it again once the failure is resolved
+        os.truncate(part_path, last_chunk_start)
+        raise
+    os.remove(meta_path)
+    invalidate_player_videos(video.player_id)
+
+    logger.info("Chunked upload %s completed as video %s", upload_id, video.id)
+    return ojsonify({
+        'message': 'Video added successfully',
+        'video': video_to_dict(video)
+    }), 201
+
 @video_bp.route('/api/players/<int:player_id>/videos/<int:video_id>', methods=['GET'])
 @login_required
 def get_video(player_id, video_id):
@@ -184,39 +663,111 @@ def get_video(player_id, video_id):
             return jsonify({'error': 'Unauthorized'}), 403
 
         if video.video_type == 'file':
-            return send_from_directory(get_upload_folder(), video.filename)
+            accel_prefix = current_app.config['UPLOAD_ACCEL_REDIRECT']
+            if accel_prefix:
+                # Let nginx send the file so the worker is freed immediately
+                mimetype = mimetypes.guess_type(video.filename)[0] or 'application/octet-stream'
+                return Response(mimetype=mimetype, headers={
+                    'X-Accel-Redirect': f"{accel_prefix.rstrip('/')}/{quote(video.filename)}"
+                })
+            return send_from_directory(get_upload_folder(), video.filename, conditional=True)
         elif video.video_type == 'youtube':
-            return jsonify({'url': video.video_url}) # Return YouTube URL instead of file
+            return ojsonify({'url': video.video_url}) # Return YouTube URL instead of file
         else:
             return jsonify({'error': 'Unknown video type'}), 500
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error serving video: {str(e)}", exc_info=True)
+        logger.error("Error serving video: %s", e, exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+def encode_video_cursor(row):
+    """Return the keyset cursor pointing just past a listed video"""
+    return f"{row.upload_date.isoformat()}_{row.id}"
+
+def decode_video_cursor(cursor):
+    """Return the (upload_date, id) pair of a cursor, raising ValueError if malformed"""
+    upload_date, video_id = cursor.rsplit('_', 1)
+    return datetime.fromisoformat(upload_date), int(video_id)
+
+def stream_video_page(rows, limit):
+    """Stream {"videos": [...], "next_cursor": ...} from up to limit + 1 rows"""
+    page = {'next_cursor': None}
+
+    def videos():
+        last = None
+        for index, row in enumerate(rows):
+            if index == limit:
+                # The extra row only tells us another page exists
+                page['next_cursor'] = encode_video_cursor(last)
+                break
+            last = row
+            yield row._asdict()
+
+    yield b'{"videos":'
+    yield from stream_json_array(videos())
+    yield b',"next_cursor":' + orjson.dumps(page['next_cursor']) + b'}'
+
 @video_bp.route('/api/players/<int:player_id>/videos', methods=['GET'])
 @login_required
 def get_player_videos(player_id):
+    """List a player's videos newest first, one page at a time
+
+    Pass the returned next_cursor as ?before= to fetch the following page;
+    ?limit= sets the page size (default 50, at most 200).
+    """
     try:
         # Check if player exists and belongs to current user
-        player = Player.query.filter_by(id=player_id, user_id=current_user.id).first()
-        if not player:
+        if get_player_owner(player_id) != current_user.id:
             return jsonify({'error': 'Player not found or unauthorized'}), 404
 
-        videos = Video.query.filter_by(player_id=player_id).all()
-        videos_data = [{
-            'id': video.id,
-            'title': video.title,
-            'type': video.video_type,
-            'youtube_id': video.youtube_id if video.video_type == 'youtube' else None,
-            'filename': video.filename if video.video_type == 'file' else None,
-            'upload_date': video.upload_date.isoformat(),
-            'duration': video.duration,
-            'filesize': video.filesize
-        } for video in videos]
-
-        return jsonify(videos_data)
+        limit = min(max(request.args.get('limit', VIDEO_PAGE_SIZE, type=int), 1), MAX_VIDEO_PAGE_SIZE)
+        before = request.args.get('before')
+
+        # Only the default first page is cached; it is what the player page
+        # loads. The generation is read before the query so a page built
+        # from rows older than an upload is cached under a retired key.
+        cache_key = None
+        if before is None and limit == VIDEO_PAGE_SIZE:
+            generation = int(get_cached(player_videos_generation_key(player_id)) or 0)
+            cache_key = player_videos_cache_key(player_id, generation)
+            cached = get_cached(cache_key)
+            if cached is not None:
+                return Response(cached, mimetype='application/json')
+
+        # Select exactly the response fields as plain rows, skipping ORM
+        # object construction
+        query = db.select(
+            Video.id,
+            Video.title,
+            Video.video_type.label('type'),
+            db.case((Video.video_type == 'youtube', Video.youtube_id)).label('youtube_id'),
+            db.case((Video.video_type == 'file', Video.filename)).label('filename'),
+            db.case((Video.video_type == 'file', Video.original_filename)).label('original_filename'),
+            Video.upload_date,
+            Video.duration,
+            Video.filesize
+        ).where(Video.player_id == player_id)
+
+        if before is not None:
+            try:
+                query = query.where(db.tuple_(Video.upload_date, Video.id) < decode_video_cursor(before))
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+        # Keyset pagination: walks ix_video_player_date from the cursor
+        # instead of counting past skipped rows like OFFSET would
+        rows = db.session.execute(
+            query.order_by(Video.upload_date.desc(), Video.id.desc()).limit(limit + 1)
+        )
+        # Stream the JSON out as rows arrive instead of building the whole
+        # page first; the joined body is cached once fully sent
+        videos_data = stream_video_page(rows, limit)
+        if cache_key:
+            videos_data = tee_to_cache(cache_key, videos_data, PLAYER_VIDEOS_CACHE_TTL)
+        return Response(stream_with_context(videos_data), mimetype='application/json')
 
     except Exception as e:
-        logger.error(f"Error fetching videos: {str(e)}", exc_info=True)
+        logger.error("Error fetching videos: %s", e, exc_info=True)
         return jsonify({'error': str(e)}), 500
\ No newline at end of file